@@ -32,12 +32,12 @@ export default function Dashboard() {
       const [summaryData, budgetData, transactions, categoriesData] = await Promise.all([
         getMonthlySummary(month, year),
         getBudgetStatus(month, year),
-        getTransactions({ month, year }),
+        getTransactions({ month, year, limit: 5 }),
         getCategories()
       ])
       setSummary(summaryData)
       setBudgetStatus(budgetData)
-      setRecentTransactions(transactions.slice(0, 5))
+      setRecentTransactions(transactions)
       setCategories(categoriesData)
     } catch (error) {
       console.error("Error fetching dashboard data:", error)
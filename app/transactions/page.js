@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect, useCallback } from "react"
+import { useState, useEffect, useCallback, useRef } from "react"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
@@ -15,7 +15,7 @@ import {
   DropdownMenuTrigger 
 } from "@/components/ui/dropdown-menu"
 import { Plus, Search, MoreHorizontal, Pencil, Trash2 } from "lucide-react"
-import { getTransactions, getCategories, deleteTransaction } from "@/lib/db"
+import { getTransactionsPage, getCategories, deleteTransaction } from "@/lib/db"
 import { formatCurrency, formatDate, getCurrentMonth, getCurrentYear } from "@/lib/utils"
 import { toast } from "sonner"
 import TransactionModal from "@/components/TransactionModal"
@@ -26,29 +26,53 @@ export default function Transactions() {
   const [year, setYear] = useState(getCurrentYear())
   const [transactions, setTransactions] = useState([])
   const [categories, setCategories] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [searchTerm, setSearchTerm] = useState("")
   const [typeFilter, setTypeFilter] = useState("all")
   const [showModal, setShowModal] = useState(false)
   const [editingTransaction, setEditingTransaction] = useState(null)
 
+  // Bumped on every reload so a page still in flight for an old month is dropped
+  const requestRef = useRef(0)
+
   const fetchData = useCallback(async () => {
+    const request = ++requestRef.current
     setLoading(true)
     try {
-      const [txData, catData] = await Promise.all([
-        getTransactions({ month, year }),
+      const [page, catData] = await Promise.all([
+        getTransactionsPage({ month, year }),
         getCategories()
       ])
-      setTransactions(txData)
+      if (request !== requestRef.current) return
+      setTransactions(page.items)
+      setNextCursor(page.next_cursor)
       setCategories(catData)
     } catch (error) {
       console.error("Error fetching transactions:", error)
       toast.error("Failed to load transactions")
     } finally {
-      setLoading(false)
+      if (request === requestRef.current) setLoading(false)
     }
   }, [month, year])
 
+  const loadMore = async () => {
+    const request = requestRef.current
+    setLoadingMore(true)
+    try {
+      const page = await getTransactionsPage({ month, year, cursor: nextCursor })
+      if (request !== requestRef.current) return
+      setTransactions(prev => [...prev, ...page.items])
+      setNextCursor(page.next_cursor)
+    } catch (error) {
+      console.error("Error fetching transactions:", error)
+      toast.error("Failed to load transactions")
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => {
     fetchData()
   }, [fetchData])
@@ -344,6 +368,19 @@ export default function Transactions() {
               </Button>
             </div>
           )}
+
+          {!loading && nextCursor && (
+            <div className="flex justify-center pt-4">
+              <Button
+                variant="outline"
+                onClick={loadMore}
+                disabled={loadingMore}
+                data-testid="load-more-btn"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
 
@@ -1,22 +1,78 @@
 // Database operations using Supabase client
 import { supabase } from './supabase'
 
+// Postgres error code raised when transactions.category_id has no match
+const FOREIGN_KEY_VIOLATION = '23503'
+
+// [start, end) date strings covering one calendar month, memoized since
+// the same few months are requested over and over
+const monthRanges = new Map()
+
+function monthRange(year, month) {
+  const key = year * 100 + month
+  let range = monthRanges.get(key)
+  if (!range) {
+    const startDate = `${year}-${String(month).padStart(2, '0')}-01`
+    const endDate = month === 12
+      ? `${year + 1}-01-01`
+      : `${year}-${String(month + 1).padStart(2, '0')}-01`
+    range = [startDate, endDate]
+    monthRanges.set(key, range)
+  }
+  return range
+}
+
+// In-memory result cache shared by categories and summaries. The promise
+// is cached so concurrent misses share one request, and every caller gets
+// its own copy of the result so mutating it cannot leak into later calls.
+async function cachedResult(cache, key, load, { ttl }) {
+  let entry = cache.get(key)
+  if (!entry || performance.now() - entry.loadedAt >= ttl) {
+    entry = { loadedAt: performance.now(), promise: load() }
+    cache.set(key, entry)
+    const current = entry
+    current.promise.catch(() => {
+      if (cache.get(key) === current) cache.delete(key)
+    })
+  }
+  return structuredClone(await entry.promise)
+}
+
+// Summaries and budget status are shown side by side, so they share one
+// cache and TTL; category and transaction writes from this tab clear it
+const SUMMARY_TTL_MS = 60 * 1000
+const summaryCache = new Map()
+
+function invalidateSummaryCache() {
+  summaryCache.clear()
+}
+
 // Categories
+// Read on nearly every page and rarely changed, so keep them for a short
+// while; category writes clear the cache
+const CATEGORIES_CACHE_TTL_MS = 30 * 1000
+const categoriesCache = new Map()
+
+function invalidateCategoriesCache() {
+  categoriesCache.clear()
+}
+
 export async function getCategories() {
+  return cachedResult(categoriesCache, 'all', loadCategories, { ttl: CATEGORIES_CACHE_TTL_MS })
+}
+
+async function loadCategories() {
   const { data, error } = await supabase
     .from('categories')
-    .select('*')
+    .select('id, name, type, budget_limit, color, created_at')
     .order('name')
   
   if (error) throw error
-  return data.map(cat => ({
-    id: cat.id,
-    name: cat.name,
-    type: cat.type,
-    budget_limit: parseFloat(cat.budget_limit) || 0,
-    color: cat.color,
-    created_at: cat.created_at
-  }))
+  // Rows already have the response shape, normalize in place
+  data.forEach(cat => {
+    cat.budget_limit = cat.budget_limit ?? 0
+  })
+  return data
 }
 
 export async function createCategory(categoryData) {
@@ -27,11 +83,13 @@ export async function createCategory(categoryData) {
     .single()
   
   if (error) throw error
+  invalidateSummaryCache()
+  invalidateCategoriesCache()
   return {
     id: data.id,
     name: data.name,
     type: data.type,
-    budget_limit: parseFloat(data.budget_limit) || 0,
+    budget_limit: data.budget_limit ?? 0,
     color: data.color,
     created_at: data.created_at
   }
@@ -46,24 +104,28 @@ export async function updateCategory(id, updates) {
     .single()
   
   if (error) throw error
+  invalidateSummaryCache()
+  invalidateCategoriesCache()
   return {
     id: data.id,
     name: data.name,
     type: data.type,
-    budget_limit: parseFloat(data.budget_limit) || 0,
+    budget_limit: data.budget_limit ?? 0,
     color: data.color,
     created_at: data.created_at
   }
 }
 
 export async function deleteCategory(id) {
-  // Check if category has transactions
-  const { count } = await supabase
+  // Check if category has transactions, one match is enough
+  const { data: existing, error: checkError } = await supabase
     .from('transactions')
-    .select('*', { count: 'exact', head: true })
+    .select('id')
     .eq('category_id', id)
+    .limit(1)
   
-  if (count > 0) {
+  if (checkError) throw checkError
+  if (existing.length > 0) {
     throw new Error('Cannot delete category with existing transactions')
   }
   
@@ -73,22 +135,23 @@ export async function deleteCategory(id) {
     .eq('id', id)
   
   if (error) throw error
+  invalidateSummaryCache()
+  invalidateCategoriesCache()
 }
 
 // Transactions
-export async function getTransactions({ month, year, type, category_id } = {}) {
-  let query = supabase
-    .from('transactions')
-    .select('*')
-    .order('date', { ascending: false })
-    .limit(1000)
-  
+const MAX_TRANSACTIONS_LIMIT = 1000
+const TRANSACTION_COLUMNS = 'id, type, amount, category_id, description, date, created_at'
+
+// Rows already have the response shape, PostgREST returns numeric columns
+// as JSON numbers; only a missing description needs filling in
+function normalizeTransaction(tx) {
+  tx.description = tx.description || ''
+}
+
+function applyTransactionFilters(query, { month, year, type, category_id }) {
   if (month && year) {
-    const startDate = `${year}-${String(month).padStart(2, '0')}-01`
-    const endMonth = month === 12 ? 1 : month + 1
-    const endYear = month === 12 ? year + 1 : year
-    const endDate = `${endYear}-${String(endMonth).padStart(2, '0')}-01`
-    
+    const [startDate, endDate] = monthRange(year, month)
     query = query
       .gte('date', startDate)
       .lt('date', endDate)
@@ -102,43 +165,100 @@ export async function getTransactions({ month, year, type, category_id } = {}) {
     query = query.eq('category_id', category_id)
   }
   
+  return query
+}
+
+export async function getTransactions({ month, year, type, category_id, limit = MAX_TRANSACTIONS_LIMIT, offset = 0 } = {}) {
+  const pageSize = Math.min(Math.max(limit, 1), MAX_TRANSACTIONS_LIMIT)
+  
+  const query = applyTransactionFilters(
+    supabase
+      .from('transactions')
+      .select(TRANSACTION_COLUMNS)
+      .order('date', { ascending: false })
+      .range(offset, offset + pageSize - 1),
+    { month, year, type, category_id }
+  )
+  
   const { data, error } = await query
   
   if (error) throw error
-  return data.map(tx => ({
-    id: tx.id,
-    type: tx.type,
-    amount: parseFloat(tx.amount),
-    category_id: tx.category_id,
-    description: tx.description || '',
-    date: tx.date,
-    created_at: tx.created_at
-  }))
+  data.forEach(normalizeTransaction)
+  return data
 }
 
-export async function createTransaction(transactionData) {
-  // Verify category exists
-  const { data: category } = await supabase
-    .from('categories')
-    .select('id')
-    .eq('id', transactionData.category_id)
-    .single()
+// Keyset pagination, newest first. The cursor is "<date>:<id>" of the last
+// row returned; transactions_page compares it as a (date, id) row value so
+// each page is an index range rather than an OFFSET scan.
+const CURSOR_PATTERN = /^(\d{4}-\d{2}-\d{2}):([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$/i
+
+export async function getTransactionsPage({ month, year, type, category_id, cursor, limit = 100 } = {}) {
+  const pageSize = Math.min(Math.max(limit, 1), MAX_TRANSACTIONS_LIMIT)
   
-  if (!category) {
-    throw new Error('Category not found')
+  let cursorDate = null
+  let cursorId = null
+  if (cursor) {
+    const match = CURSOR_PATTERN.exec(cursor)
+    if (!match) {
+      throw new Error('Invalid cursor')
+    }
+    cursorDate = match[1]
+    cursorId = match[2]
+  }
+  
+  const [startDate, endDate] = month && year ? monthRange(year, month) : [null, null]
+  
+  const { data, error } = await supabase
+    .rpc('transactions_page', {
+      page_size: pageSize,
+      start_date: startDate,
+      end_date: endDate,
+      tx_type: type || null,
+      filter_category_id: category_id || null,
+      cursor_date: cursorDate,
+      cursor_id: cursorId
+    })
+    .select(TRANSACTION_COLUMNS)
+  
+  if (error) throw error
+  data.forEach(normalizeTransaction)
+  
+  const last = data[data.length - 1]
+  return {
+    items: data,
+    next_cursor: data.length === pageSize ? `${last.date}:${last.id}` : null
   }
+}
+
+export async function getTransactionCount({ month, year, type, category_id } = {}) {
+  const { count, error } = await applyTransactionFilters(
+    supabase
+      .from('transactions')
+      .select('id', { count: 'exact', head: true }),
+    { month, year, type, category_id }
+  )
   
+  if (error) throw error
+  return count
+}
+
+export async function createTransaction(transactionData) {
+  // The category_id foreign key verifies the category exists
   const { data, error } = await supabase
     .from('transactions')
     .insert(transactionData)
     .select()
     .single()
   
+  if (error?.code === FOREIGN_KEY_VIOLATION) {
+    throw new Error('Category not found')
+  }
   if (error) throw error
+  invalidateSummaryCache()
   return {
     id: data.id,
     type: data.type,
-    amount: parseFloat(data.amount),
+    amount: data.amount,
     category_id: data.category_id,
     description: data.description || '',
     date: data.date,
@@ -146,20 +266,25 @@ export async function createTransaction(transactionData) {
   }
 }
 
-export async function updateTransaction(id, updates) {
-  if (updates.category_id) {
-    // Verify category exists
-    const { data: category } = await supabase
-      .from('categories')
-      .select('id')
-      .eq('id', updates.category_id)
-      .single()
-    
-    if (!category) {
-      throw new Error('Category not found')
-    }
-  }
+export async function createTransactions(transactions) {
+  if (transactions.length === 0) return { inserted: 0 }
   
+  // One multi-row insert; the foreign key rejects the whole batch if any
+  // category is unknown
+  const { error } = await supabase
+    .from('transactions')
+    .insert(transactions)
+  
+  if (error?.code === FOREIGN_KEY_VIOLATION) {
+    throw new Error('Category not found')
+  }
+  if (error) throw error
+  invalidateSummaryCache()
+  return { inserted: transactions.length }
+}
+
+export async function updateTransaction(id, updates) {
+  // The category_id foreign key verifies the category exists
   const { data, error } = await supabase
     .from('transactions')
     .update(updates)
@@ -167,11 +292,15 @@ export async function updateTransaction(id, updates) {
     .select()
     .single()
   
+  if (error?.code === FOREIGN_KEY_VIOLATION) {
+    throw new Error('Category not found')
+  }
   if (error) throw error
+  invalidateSummaryCache()
   return {
     id: data.id,
     type: data.type,
-    amount: parseFloat(data.amount),
+    amount: data.amount,
     category_id: data.category_id,
     description: data.description || '',
     date: data.date,
@@ -186,64 +315,59 @@ export async function deleteTransaction(id) {
     .eq('id', id)
   
   if (error) throw error
+  invalidateSummaryCache()
 }
 
 // Summary functions
 export async function getMonthlySummary(month, year) {
-  const startDate = `${year}-${String(month).padStart(2, '0')}-01`
-  const endMonth = month === 12 ? 1 : month + 1
-  const endYear = month === 12 ? year + 1 : year
-  const endDate = `${endYear}-${String(endMonth).padStart(2, '0')}-01`
-  
-  // Get transactions
-  const { data: transactions } = await supabase
-    .from('transactions')
-    .select('type, amount, category_id')
-    .gte('date', startDate)
-    .lt('date', endDate)
-  
-  // Get categories
-  const { data: categories } = await supabase
-    .from('categories')
-    .select('*')
+  return cachedResult(
+    summaryCache,
+    `month:${year}-${month}`,
+    () => loadMonthlySummary(month, year),
+    { ttl: SUMMARY_TTL_MS }
+  )
+}
+
+async function loadMonthlySummary(month, year) {
+  const [startDate, endDate] = monthRange(year, month)
   
-  const catMap = {}
-  categories.forEach(cat => {
-    catMap[cat.id] = cat
+  // Sums are grouped by category and transaction type in Postgres
+  const { data: rows, error } = await supabase.rpc('monthly_category_totals', {
+    start_date: startDate,
+    end_date: endDate
   })
   
+  if (error) throw error
+  
   let totalIncome = 0
   let totalExpenses = 0
   let totalInvestments = 0
-  const categoryTotals = {}
+  const breakdownMap = {}
   
-  transactions.forEach(tx => {
-    const amount = parseFloat(tx.amount)
-    if (tx.type === 'income') {
+  rows.forEach(row => {
+    const amount = row.total
+    if (row.tx_type === 'income') {
       totalIncome += amount
-    } else if (tx.type === 'investment') {
+    } else if (row.tx_type === 'investment') {
       totalInvestments += amount
     } else {
       totalExpenses += amount
     }
     
-    if (!categoryTotals[tx.category_id]) {
-      categoryTotals[tx.category_id] = 0
+    if (!breakdownMap[row.category_id]) {
+      breakdownMap[row.category_id] = {
+        category_id: row.category_id,
+        category_name: row.category_name || 'Unknown',
+        type: row.category_type || 'expense',
+        total: 0,
+        budget_limit: row.budget_limit ?? 0,
+        color: row.color || '#3D405B'
+      }
     }
-    categoryTotals[tx.category_id] += amount
+    breakdownMap[row.category_id].total += amount
   })
   
-  const categoryBreakdown = Object.entries(categoryTotals).map(([catId, total]) => {
-    const cat = catMap[catId] || {}
-    return {
-      category_id: catId,
-      category_name: cat.name || 'Unknown',
-      type: cat.type || 'expense',
-      total: total,
-      budget_limit: parseFloat(cat.budget_limit) || 0,
-      color: cat.color || '#3D405B'
-    }
-  })
+  const categoryBreakdown = Object.values(breakdownMap)
   
   return {
     month,
@@ -257,43 +381,30 @@ export async function getMonthlySummary(month, year) {
 }
 
 export async function getYearlySummary(year) {
-  const monthlyData = []
+  return cachedResult(
+    summaryCache,
+    `year:${year}`,
+    () => loadYearlySummary(year),
+    { ttl: SUMMARY_TTL_MS }
+  )
+}
+
+async function loadYearlySummary(year) {
+  // Postgres aggregates and pivots the year into exactly twelve rows
+  const { data: rows, error } = await supabase.rpc('yearly_summary', {
+    start_date: `${year}-01-01`,
+    end_date: `${year + 1}-01-01`
+  })
   
-  for (let month = 1; month <= 12; month++) {
-    const startDate = `${year}-${String(month).padStart(2, '0')}-01`
-    const endMonth = month === 12 ? 1 : month + 1
-    const endYear = month === 12 ? year + 1 : year
-    const endDate = `${endYear}-${String(endMonth).padStart(2, '0')}-01`
-    
-    const { data: transactions } = await supabase
-      .from('transactions')
-      .select('type, amount')
-      .gte('date', startDate)
-      .lt('date', endDate)
-    
-    let income = 0
-    let expenses = 0
-    let investments = 0
-    
-    transactions.forEach(tx => {
-      const amount = parseFloat(tx.amount)
-      if (tx.type === 'income') {
-        income += amount
-      } else if (tx.type === 'investment') {
-        investments += amount
-      } else {
-        expenses += amount
-      }
-    })
-    
-    monthlyData.push({
-      month,
-      income,
-      expenses,
-      investments,
-      balance: income - expenses
-    })
-  }
+  if (error) throw error
+  
+  const monthlyData = rows.map(row => ({
+    month: row.month,
+    income: row.income,
+    expenses: row.expenses,
+    investments: row.investments,
+    balance: row.income - row.expenses
+  }))
   
   return {
     year,
@@ -305,48 +416,24 @@ export async function getYearlySummary(year) {
 }
 
 export async function getBudgetStatus(month, year) {
-  const startDate = `${year}-${String(month).padStart(2, '0')}-01`
-  const endMonth = month === 12 ? 1 : month + 1
-  const endYear = month === 12 ? year + 1 : year
-  const endDate = `${endYear}-${String(endMonth).padStart(2, '0')}-01`
-  
-  // Get expense categories
-  const { data: categories } = await supabase
-    .from('categories')
-    .select('*')
-    .eq('type', 'expense')
+  return cachedResult(
+    summaryCache,
+    `budget:${year}-${month}`,
+    () => loadBudgetStatus(month, year),
+    { ttl: SUMMARY_TTL_MS }
+  )
+}
+
+async function loadBudgetStatus(month, year) {
+  const [startDate, endDate] = monthRange(year, month)
   
-  // Get spending by category
-  const { data: transactions } = await supabase
-    .from('transactions')
-    .select('category_id, amount')
-    .eq('type', 'expense')
-    .gte('date', startDate)
-    .lt('date', endDate)
-  
-  const spendingMap = {}
-  transactions.forEach(tx => {
-    if (!spendingMap[tx.category_id]) {
-      spendingMap[tx.category_id] = 0
-    }
-    spendingMap[tx.category_id] += parseFloat(tx.amount)
+  // Spent, remaining and percentage are computed in Postgres, and the
+  // columns already match the response fields
+  const { data, error } = await supabase.rpc('budget_status', {
+    start_date: startDate,
+    end_date: endDate
   })
   
-  return categories.map(cat => {
-    const spent = spendingMap[cat.id] || 0
-    const budgetLimit = parseFloat(cat.budget_limit) || 0
-    const percentage = budgetLimit > 0 ? (spent / budgetLimit) * 100 : 0
-    
-    return {
-      category_id: cat.id,
-      category_name: cat.name,
-      budget_limit: budgetLimit,
-      spent: spent,
-      remaining: Math.max(0, budgetLimit - spent),
-      percentage: Math.min(percentage, 100),
-      over_budget: budgetLimit > 0 && spent > budgetLimit,
-      color: cat.color
-    }
-  })
+  if (error) throw error
+  return data
 }
-
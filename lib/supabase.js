@@ -7,5 +7,28 @@ if (!supabaseUrl || !supabaseAnonKey) {
   throw new Error('Missing Supabase environment variables')
 }
 
-export const supabase = createClient(supabaseUrl, supabaseAnonKey)
+// Fail fast instead of leaving the UI on "Loading..." when Supabase is
+// unreachable
+const REQUEST_TIMEOUT_MS = 10 * 1000
+
+function fetchWithTimeout(input, init = {}) {
+  return fetch(input, {
+    ...init,
+    signal: init.signal ?? AbortSignal.timeout(REQUEST_TIMEOUT_MS)
+  })
+}
+
+// Single client shared by every query. The app has no authentication, so
+// skip the session storage, token refresh timer and URL session parsing
+// supabase-js runs by default
+export const supabase = createClient(supabaseUrl, supabaseAnonKey, {
+  auth: {
+    persistSession: false,
+    autoRefreshToken: false,
+    detectSessionInUrl: false
+  },
+  global: {
+    fetch: fetchWithTimeout
+  }
+})
 
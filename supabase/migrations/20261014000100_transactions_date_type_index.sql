@@ -0,0 +1,3 @@
+-- Serves the date-range scans behind the monthly and yearly summaries
+create index if not exists idx_transactions_date_type
+  on transactions (date, type);
@@ -0,0 +1,34 @@
+-- One row per calendar month of the range with its income, expense and
+-- investment totals, so the result size never depends on how many
+-- transactions the year holds (PostgREST caps responses at max_rows).
+
+create or replace function yearly_summary(start_date date, end_date date)
+returns table (
+  month integer,
+  income numeric,
+  expenses numeric,
+  investments numeric
+)
+language sql
+stable
+as $$
+  with totals as (
+    select
+      extract(month from t.date)::integer as month,
+      coalesce(sum(t.amount) filter (where t.type::text = 'income'), 0) as income,
+      coalesce(sum(t.amount) filter (where t.type::text = 'investment'), 0) as investments,
+      coalesce(sum(t.amount) filter (where coalesce(t.type::text, '') not in ('income', 'investment')), 0) as expenses
+    from transactions t
+    where t.date >= start_date
+      and t.date < end_date
+    group by 1
+  )
+  select
+    m.month,
+    coalesce(totals.income, 0),
+    coalesce(totals.expenses, 0),
+    coalesce(totals.investments, 0)
+  from generate_series(1, 12) as m(month)
+  left join totals on totals.month = m.month
+  order by m.month
+$$;
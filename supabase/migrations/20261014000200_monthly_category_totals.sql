@@ -0,0 +1,32 @@
+-- Per-category totals for a date range, split by transaction type so the
+-- client can derive both the month totals and the category breakdown
+create or replace function monthly_category_totals(start_date date, end_date date)
+returns table (
+  category_id uuid,
+  tx_type text,
+  category_name text,
+  category_type text,
+  budget_limit numeric,
+  color text,
+  total numeric
+)
+language sql
+stable
+as $$
+  select
+    t.category_id,
+    t.type::text,
+    c.name::text,
+    c.type::text,
+    c.budget_limit,
+    c.color::text,
+    sum(t.amount)
+  from transactions t
+  left join categories c on c.id = t.category_id
+  where t.date >= start_date
+    and t.date < end_date
+  group by t.category_id, t.type, c.id
+$$;
+
+create index if not exists idx_transactions_date_category_id
+  on transactions (date, category_id);
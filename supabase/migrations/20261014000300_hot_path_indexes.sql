@@ -0,0 +1,7 @@
+-- Category filters on transactions (getTransactions, deleteCategory)
+create index if not exists idx_transactions_category_id_date
+  on transactions (category_id, date);
+
+-- Expense-only category lookups (getBudgetStatus)
+create index if not exists idx_categories_type
+  on categories (type);
@@ -0,0 +1,31 @@
+-- createTransaction, createTransactions and updateTransaction rely on this
+-- constraint to reject unknown categories instead of checking beforehand,
+-- so make sure category_id itself is covered, not just any column that
+-- happens to reference categories.
+--
+-- The constraint is added NOT VALID: it is enforced for every new insert
+-- and update immediately, but existing rows are not checked here. Before
+-- this series categories were only enforced by racy app-side checks, so
+-- orphaned category_id values may exist and would abort a plain ADD
+-- CONSTRAINT. The next migration reports orphans and validates the
+-- constraint once there are none.
+do $$
+begin
+  if not exists (
+    select 1
+    from pg_constraint con
+    join pg_attribute att
+      on att.attrelid = con.conrelid
+      and att.attnum = any (con.conkey)
+    where con.conrelid = 'transactions'::regclass
+      and con.confrelid = 'categories'::regclass
+      and con.contype = 'f'
+      and att.attname = 'category_id'
+  ) then
+    alter table transactions
+      add constraint transactions_category_id_fkey
+      foreign key (category_id) references categories (id)
+      not valid;
+  end if;
+end
+$$;
@@ -0,0 +1,38 @@
+-- Validate transactions_category_id_fkey (added NOT VALID by the previous
+-- migration) only when no transaction points at a missing category.
+-- Otherwise leave it NOT VALID, which still guards new writes, and warn
+-- with the orphan count. To list the orphans:
+--
+--   select t.*
+--   from transactions t
+--   where t.category_id is not null
+--     and not exists (select 1 from categories c where c.id = t.category_id);
+--
+-- Reassign or delete them, then rerun this migration or run
+--   alter table transactions validate constraint transactions_category_id_fkey;
+do $$
+declare
+  orphans bigint;
+begin
+  if not exists (
+    select 1
+    from pg_constraint
+    where conrelid = 'transactions'::regclass
+      and conname = 'transactions_category_id_fkey'
+      and not convalidated
+  ) then
+    return;
+  end if;
+
+  select count(*) into orphans
+  from transactions t
+  where t.category_id is not null
+    and not exists (select 1 from categories c where c.id = t.category_id);
+
+  if orphans > 0 then
+    raise warning '% transaction(s) reference missing categories; transactions_category_id_fkey left NOT VALID', orphans;
+  else
+    alter table transactions validate constraint transactions_category_id_fkey;
+  end if;
+end
+$$;
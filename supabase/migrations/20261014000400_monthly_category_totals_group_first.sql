@@ -0,0 +1,33 @@
+-- Aggregate the month's transactions before joining categories, so the
+-- join sees one row per (category, type) instead of every transaction
+create or replace function monthly_category_totals(start_date date, end_date date)
+returns table (
+  category_id uuid,
+  tx_type text,
+  category_name text,
+  category_type text,
+  budget_limit numeric,
+  color text,
+  total numeric
+)
+language sql
+stable
+as $$
+  with totals as (
+    select t.category_id, t.type::text as tx_type, sum(t.amount) as total
+    from transactions t
+    where t.date >= start_date
+      and t.date < end_date
+    group by t.category_id, t.type
+  )
+  select
+    totals.category_id,
+    totals.tx_type,
+    c.name::text,
+    c.type::text,
+    c.budget_limit,
+    c.color::text,
+    totals.total
+  from totals
+  left join categories c on c.id = totals.category_id
+$$;
@@ -0,0 +1,11 @@
+-- Cover the summary aggregations so they can run as index-only scans.
+-- Supersedes the plain (date, type) and (date, category_id) indexes.
+-- On a large live table, run these statements by hand with
+-- "create index concurrently" outside a transaction instead.
+create index if not exists idx_transactions_date_type_covering
+  on transactions (date, type) include (amount, category_id);
+
+drop index if exists idx_transactions_date_type;
+drop index if exists idx_transactions_date_category_id;
+
+analyze transactions;
@@ -0,0 +1,46 @@
+-- Spending against budget for every expense category in a date range,
+-- already in the shape getBudgetStatus returns
+create or replace function budget_status(start_date date, end_date date)
+returns table (
+  category_id uuid,
+  category_name text,
+  budget_limit numeric,
+  spent numeric,
+  remaining numeric,
+  percentage numeric,
+  over_budget boolean,
+  color text
+)
+language sql
+stable
+as $$
+  with spending as (
+    select t.category_id, sum(t.amount) as spent
+    from transactions t
+    where t.type = 'expense'
+      and t.date >= start_date
+      and t.date < end_date
+    group by t.category_id
+  ),
+  budgets as (
+    select
+      c.id,
+      c.name,
+      coalesce(c.budget_limit, 0) as budget_limit,
+      coalesce(s.spent, 0) as spent,
+      c.color
+    from categories c
+    left join spending s on s.category_id = c.id
+    where c.type = 'expense'
+  )
+  select
+    b.id,
+    b.name::text,
+    b.budget_limit,
+    b.spent,
+    greatest(0, b.budget_limit - b.spent),
+    least(100, coalesce(b.spent / nullif(b.budget_limit, 0) * 100, 0)),
+    b.budget_limit > 0 and b.spent > b.budget_limit,
+    b.color::text
+  from budgets b
+$$;
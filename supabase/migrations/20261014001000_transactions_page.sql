@@ -0,0 +1,30 @@
+-- Keyset pagination for getTransactionsPage. The cursor is compared as a
+-- row value, (date, id) < (cursor_date, cursor_id), which the
+-- (date desc, id desc) index below serves as a single range scan.
+-- Filters are optional: null means "don't filter".
+create index if not exists idx_transactions_date_id_desc
+  on transactions (date desc, id desc);
+
+create or replace function transactions_page(
+  page_size integer,
+  start_date date default null,
+  end_date date default null,
+  tx_type text default null,
+  filter_category_id uuid default null,
+  cursor_date date default null,
+  cursor_id uuid default null
+)
+returns setof transactions
+language sql
+stable
+as $$
+  select t.*
+  from transactions t
+  where (start_date is null or t.date >= start_date)
+    and (end_date is null or t.date < end_date)
+    and (tx_type is null or t.type::text = tx_type)
+    and (filter_category_id is null or t.category_id = filter_category_id)
+    and (cursor_date is null or (t.date, t.id) < (cursor_date, cursor_id))
+  order by t.date desc, t.id desc
+  limit page_size
+$$;